@@ -118,8 +118,8 @@ def app_metadata_docs(features) -> craft_application.AppMetadata:
         )
 
 
-@pytest.fixture
-def fake_project() -> models.Project:
+def _create_fake_project() -> models.Project:
+    """Create a fully-defined project that builds on the running system."""
     arch = util.get_host_architecture()
     return models.Project(
         name="full-project",  # pyright: ignore[reportArgumentType]
@@ -139,6 +139,11 @@ def fake_project() -> models.Project:
     )
 
 
+@pytest.fixture
+def fake_project() -> models.Project:
+    return _create_fake_project()
+
+
 @pytest.fixture
 def fake_build_plan(request) -> list[models.BuildInfo]:
     num_infos = getattr(request, "param", 1)
@@ -14,17 +14,21 @@
 #  You should have received a copy of the GNU Lesser General Public License
 #  along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """Configuration for craft-application integration tests."""
+import contextlib
 import os
 import pathlib
 import sys
 import tempfile
+from collections.abc import Iterator
 from unittest import mock
 
 import pytest
-from craft_application import launchpad
+from craft_application import launchpad, services
 from craft_application.services import provider, remotebuild
 from craft_providers import bases, lxd, multipass
 
+from tests.conftest import _create_fake_build_plan, _create_fake_project
+
 
 def pytest_configure(config: pytest.Config):
     config.addinivalue_line("markers", "multipass: tests that require multipass")
@@ -55,6 +59,29 @@ def provider_service(app_metadata, fake_project, fake_build_plan, fake_services)
     )
 
 
+@pytest.fixture(scope="module")
+def module_fake_services(default_app_metadata):
+    """A module-scoped service factory, for services shared between tests."""
+    return services.ServiceFactory(
+        default_app_metadata,
+        project=_create_fake_project(),
+        PackageClass=services.PackageService,
+    )
+
+
+@pytest.fixture(scope="module")
+def module_provider_service(default_app_metadata, module_fake_services):
+    """A module-scoped provider service, for tests that share an instance."""
+    return provider.ProviderService(
+        default_app_metadata,
+        module_fake_services,
+        project=module_fake_services.project,
+        work_dir=pathlib.Path(),
+        build_plan=_create_fake_build_plan(),
+        install_snap=False,
+    )
+
+
 @pytest.fixture(scope="session")
 def anonymous_remote_build_service(default_app_metadata):
     """Provider service with install snap disabled for integration tests"""
@@ -63,17 +90,8 @@ def anonymous_remote_build_service(default_app_metadata):
     return service
 
 
-@pytest.fixture
-def snap_safe_tmp_path():
-    """A temporary path accessible to snap-confined craft providers.
-
-    Some providers (notably Multipass) don't have access to /tmp  on Linux. This
-    provides a temporary path that the provider can use, preferring $XDG_RUNTIME_DIR
-    if it exists.
-
-    On Non-Linux platforms providers aren't confined, so we can use the default
-    temporary directory.
-    """
+@contextlib.contextmanager
+def _snap_safe_tmp_path() -> Iterator[pathlib.Path]:
     if sys.platform != "linux":
         with tempfile.TemporaryDirectory() as temp_dir:
             yield pathlib.Path(temp_dir)
@@ -87,6 +105,28 @@ def snap_safe_tmp_path():
         yield pathlib.Path(temp_dir)
 
 
+@pytest.fixture
+def snap_safe_tmp_path():
+    """A temporary path accessible to snap-confined craft providers.
+
+    Some providers (notably Multipass) don't have access to /tmp  on Linux. This
+    provides a temporary path that the provider can use, preferring $XDG_RUNTIME_DIR
+    if it exists.
+
+    On Non-Linux platforms providers aren't confined, so we can use the default
+    temporary directory.
+    """
+    with _snap_safe_tmp_path() as temp_dir:
+        yield temp_dir
+
+
+@pytest.fixture(scope="module")
+def module_snap_safe_tmp_path():
+    """A module-scoped version of ``snap_safe_tmp_path``."""
+    with _snap_safe_tmp_path() as temp_dir:
+        yield temp_dir
+
+
 @pytest.fixture
 def pretend_jammy(mocker) -> None:
     """Pretend we're running on jammy. Used for tests that use destructive mode."""
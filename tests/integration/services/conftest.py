@@ -0,0 +1,98 @@
+#  This file is part of craft-application.
+#
+#  Copyright 2024 Canonical Ltd.
+#
+#  This program is free software: you can redistribute it and/or modify it
+#  under the terms of the GNU Lesser General Public License version 3, as
+#  published by the Free Software Foundation.
+#
+#  This program is distributed in the hope that it will be useful, but WITHOUT
+#  ANY WARRANTY; without even the implied warranties of MERCHANTABILITY,
+#  SATISFACTORY QUALITY, or FITNESS FOR A PARTICULAR PURPOSE.
+#  See the GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""Configuration for craft-application service integration tests."""
+import contextlib
+import pathlib
+import shutil
+import tempfile
+from functools import cache
+from unittest import mock
+
+import craft_providers
+import pytest
+from craft_application import fetch
+
+
+@cache
+def _get_original_base_dir():
+    """Get the real base dir of the fetch-service, before any patching."""
+    return fetch._get_service_base_dir()
+
+
+@cache
+def _get_fake_certificate_dir():
+    base_dir = _get_original_base_dir()
+
+    return base_dir / "test-craft-app/fetch-certificate"
+
+
+# The certificate is deterministic for a given certificate dir, so only obtain it
+# once for the whole session.
+_cached_obtain_certificate = cache(fetch._obtain_certificate)
+
+
+@pytest.fixture(scope="session")
+def _set_test_certificate_dir():
+    """A session-scoped fixture so that we generate the certificate only once"""
+    cert_dir = _get_fake_certificate_dir()
+    if cert_dir.is_dir():
+        shutil.rmtree(cert_dir)
+
+    with mock.patch.object(fetch, "_get_certificate_dir", return_value=cert_dir):
+        _cached_obtain_certificate()
+    yield
+    _cached_obtain_certificate.cache_clear()
+
+
+@pytest.fixture(scope="session")
+def fetch_test_base_dir():
+    """A temporary base dir for the fetch-service, shared by the whole session.
+
+    The fetch-service snap is strictly confined and can't see pytest's
+    ``tmp_path``, so the directory is created inside the snap's own base dir.
+    """
+    with tempfile.TemporaryDirectory(
+        prefix="test-", dir=_get_original_base_dir()
+    ) as temp_dir:
+        yield pathlib.Path(temp_dir)
+
+
+@pytest.fixture(scope="module")
+def _set_test_base_dirs(_set_test_certificate_dir, fetch_test_base_dir):
+    """Point the fetch-service to the test dirs for a whole test module.
+
+    Use it in fetch-service test modules with
+    ``pytestmark = pytest.mark.usefixtures("_set_test_base_dirs")``.
+    """
+    cert_dir = _get_fake_certificate_dir()
+
+    with pytest.MonkeyPatch.context() as m:
+        m.setattr(fetch, "_get_service_base_dir", lambda: fetch_test_base_dir)
+        m.setattr(fetch, "_get_certificate_dir", lambda: cert_dir)
+        m.setattr(fetch, "_obtain_certificate", _cached_obtain_certificate)
+        yield
+
+
+@pytest.fixture
+def mock_instance():
+    @contextlib.contextmanager
+    def temporarily_pull_file(*, source, missing_ok):  # noqa: ARG001 (unused arguments)
+        yield None
+
+    instance = mock.Mock(spec=craft_providers.Executor)
+    instance.temporarily_pull_file = temporarily_pull_file
+
+    return instance
@@ -18,132 +18,47 @@ import contextlib
 import io
 import json
 import pathlib
-import shutil
-import socket
-import textwrap
-from functools import cache
-from unittest import mock
 
 import craft_providers
 import pytest
-from craft_application import errors, fetch, services, util
+from craft_application import fetch, services, util
 from craft_application.models import BuildInfo
 from craft_application.services.fetch import _PROJECT_MANIFEST_MANAGED_PATH
 from craft_providers import bases
 
+from tests.conftest import _create_fake_build_plan
 
-@cache
-def _get_fake_certificate_dir():
-    base_dir = fetch._get_service_base_dir()
+pytestmark = [pytest.mark.usefixtures("_set_test_base_dirs"), pytest.mark.serial]
 
-    return base_dir / "test-craft-app/fetch-certificate"
 
-
-@pytest.fixture(autouse=True, scope="session")
-def _set_test_certificate_dir():
-    """A session-scoped fixture so that we generate the certificate only once"""
-    cert_dir = _get_fake_certificate_dir()
-    if cert_dir.is_dir():
-        shutil.rmtree(cert_dir)
-
-    with mock.patch.object(fetch, "_get_certificate_dir", return_value=cert_dir):
-        fetch._obtain_certificate()
-
-
-@pytest.fixture(autouse=True)
-def _set_test_base_dirs(mocker):
-    original = fetch._get_service_base_dir()
-    test_dir = original / "test"
-    if test_dir.exists():
-        shutil.rmtree(test_dir)
-    test_dir.mkdir()
-    mocker.patch.object(fetch, "_get_service_base_dir", return_value=test_dir)
-
-    cert_dir = _get_fake_certificate_dir()
-    mocker.patch.object(fetch, "_get_certificate_dir", return_value=cert_dir)
-
-
-@pytest.fixture
-def mock_instance():
-    @contextlib.contextmanager
-    def temporarily_pull_file(*, source, missing_ok):  # noqa: ARG001 (unused arguments)
-        yield None
-
-    instance = mock.Mock(spec=craft_providers.Executor)
-    instance.temporarily_pull_file = temporarily_pull_file
-
-    return instance
-
-
-@pytest.fixture
-def app_service(app_metadata, fake_services, fake_project, fake_build_plan):
+@pytest.fixture(scope="module")
+def shared_app_service(_set_test_base_dirs, default_app_metadata, module_fake_services):
+    """A fetch-service that is kept running for all the tests in the module."""
     fetch_service = services.FetchService(
-        app_metadata, fake_services, project=fake_project, build_plan=fake_build_plan
+        default_app_metadata,
+        module_fake_services,
+        project=module_fake_services.project,
+        build_plan=_create_fake_build_plan(),
     )
+    fetch_service.setup()
     yield fetch_service
     fetch_service.shutdown(force=True)
 
 
-def test_start_service(app_service):
-    assert not fetch.is_service_online()
-    app_service.setup()
-    assert fetch.is_service_online()
-
-
-def test_start_service_already_up(app_service, request):
-    # Create a fetch-service "manually"
-    fetch_process = fetch.start_service()
-    assert fetch.is_service_online()
-    # Ensure its cleaned up when the test is done
-    if fetch_process is not None:
-        request.addfinalizer(lambda: fetch.stop_service(fetch_process))
-
-    app_service.setup()
-    assert fetch.is_service_online()
-
-
-@pytest.mark.parametrize(
-    "port",
-    [
-        pytest.param(
-            fetch._DEFAULT_CONFIG.control,
-            marks=pytest.mark.xfail(
-                reason="Needs https://github.com/canonical/fetch-service/issues/208 fixed",
-                strict=True,
-            ),
-        ),
-        fetch._DEFAULT_CONFIG.proxy,
-    ],
-)
-def test_start_service_port_taken(app_service, request, port):
-    # "Occupy" one of the necessary ports manually.
-    soc = socket.create_server(("localhost", port), reuse_port=True)
-    request.addfinalizer(soc.close)
-
-    assert not fetch.is_service_online()
-
-    proxy = fetch._DEFAULT_CONFIG.proxy
-    control = fetch._DEFAULT_CONFIG.control
-
-    expected = f"fetch-service ports {proxy} and {control} are already in use."
-    with pytest.raises(errors.FetchServiceError, match=expected):
-        app_service.setup()
-
-
-def test_shutdown_service(app_service):
-    assert not fetch.is_service_online()
-
-    app_service.setup()
+@pytest.fixture
+def app_service(shared_app_service, monkeypatch, tmp_path):
+    """The shared fetch-service, with no live session left over between tests."""
+    if not fetch.is_service_online():
+        # The fetch-service shuts itself down after a while with no live sessions.
+        shared_app_service.setup()
     assert fetch.is_service_online()
 
-    # By default, shutdown() without parameters doesn't actually stop the
-    # fetch-service.
-    app_service.shutdown()
-    assert fetch.is_service_online()
+    yield shared_app_service
 
-    # shutdown(force=True) must stop the fetch-service.
-    app_service.shutdown(force=True)
-    assert not fetch.is_service_online()
+    if shared_app_service._session_data is not None:
+        # Tearing down a session may write the craft manifest to the cwd.
+        monkeypatch.chdir(tmp_path)
+        shared_app_service.teardown_session()
 
 
 def test_create_teardown_session(
@@ -151,7 +66,6 @@ def test_create_teardown_session(
 ):
     monkeypatch.chdir(tmp_path)
     mocker.patch.object(fetch, "_get_gateway", return_value="127.0.0.1")
-    app_service.setup()
 
     assert len(fetch.get_service_status()["active-sessions"]) == 0
 
@@ -164,77 +78,36 @@ def test_create_teardown_session(
     assert "artefacts" in report
 
 
-def test_service_logging(app_service, mocker, tmp_path, monkeypatch, mock_instance):
-    monkeypatch.chdir(tmp_path)
-    mocker.patch.object(fetch, "_get_gateway", return_value="127.0.0.1")
-
-    logfile = fetch._get_log_filepath()
-    assert not logfile.is_file()
-
-    app_service.setup()
-
-    # Create and teardown two sessions
-    app_service.create_session(mock_instance)
-    app_service.teardown_session()
-    app_service.create_session(mock_instance)
-    app_service.teardown_session()
-
-    # Check the logfile for the creation/deletion of the two sessions
-    expected = 2
-    assert logfile.is_file()
-    lines = logfile.read_text().splitlines()
-    create = discard = 0
-    for line in lines:
-        if "creating session" in line:
-            create += 1
-        if "discarding session" in line:
-            discard += 1
-    assert create == discard == expected
-
-
 # Bash script to setup the build instance before the actual testing.
-setup_environment = (
-    textwrap.dedent(
-        """
-    #! /bin/bash
-    set -euo pipefail
-
-    apt install -y python3.10-venv
-    python3 -m venv venv
-    venv/bin/pip install requests
+setup_environment = b"""\
+#! /bin/bash
+set -euo pipefail
+
+apt install -y python3.10-venv
+python3 -m venv venv
+venv/bin/pip install requests
 """
-    )
-    .strip()
-    .encode("ascii")
-)
 
+# This wheel must be downloaded through the fetch-service on every run, as the
+# test checks that it shows up in the session report. Don't serve it from a local
+# mirror.
 wheel_url = (
     "https://files.pythonhosted.org/packages/0f/ec/"
     "a9b769274512ea65d8484c2beb8c3d2686d1323b450ce9ee6d09452ac430/"
     "craft_application-3.0.0-py3-none-any.whl"
 )
-# Bash script to fetch the craft-application wheel.
-check_requests = (
-    textwrap.dedent(
-        f"""
-    #! /bin/bash
-    set -euo pipefail
-
-    venv/bin/python -c "import requests; requests.get('{wheel_url}').raise_for_status()"
-"""
-    )
-    .strip()
-    .encode("ascii")
-)
 
 
-@pytest.fixture
-def lxd_instance(snap_safe_tmp_path, provider_service):
-    provider_service.get_provider("lxd")
+@pytest.fixture(scope="module")
+def module_lxd_executor(module_snap_safe_tmp_path, module_provider_service):
+    """A module-scoped LXD instance, so that it is only set up once."""
+    module_provider_service.get_provider("lxd")
 
     arch = util.get_host_architecture()
     build_info = BuildInfo("foo", arch, arch, bases.BaseName("ubuntu", "22.04"))
-    instance = provider_service.instance(build_info, work_dir=snap_safe_tmp_path)
+    instance = module_provider_service.instance(
+        build_info, work_dir=module_snap_safe_tmp_path
+    )
 
     with instance as executor:
         executor.push_file_io(
@@ -254,12 +127,42 @@ def lxd_instance(snap_safe_tmp_path, provider_service):
             executor.delete()
 
 
+@pytest.fixture
+def lxd_instance(module_lxd_executor):
+    yield module_lxd_executor
+
+    # Roll back the changes made by the tests and by fetch.configure_instance()
+    # on the shared instance, so that no configuration points to a dead session.
+    rollback_commands = [
+        ["apt-get", "remove", "-y", "hello"],
+        [
+            "rm",
+            "-f",
+            "/etc/apt/apt.conf.d/99proxy",
+            "/root/.pip/pip.conf",
+            str(fetch._FETCH_CERT_INSTANCE_PATH),
+        ],
+        ["/usr/sbin/update-ca-certificates", "--fresh"],
+        ["snap", "unset", "system", "proxy.http", "proxy.https"],
+    ]
+    for command in rollback_commands:
+        module_lxd_executor.execute_run(command, check=True, capture_output=True)
+
+
 def test_build_instance_integration(
-    app_service, lxd_instance, tmp_path, monkeypatch, fake_project, manifest_data_dir
+    lxd_instance, app_service, tmp_path, monkeypatch, fake_project, manifest_data_dir
 ):
+    # lxd_instance is requested first so that the slow instance provisioning
+    # happens before app_service checks that the fetch-service is still online.
     monkeypatch.chdir(tmp_path)
 
-    app_service.setup()
+    # Bash script to fetch the craft-application wheel.
+    check_requests = f"""\
+#! /bin/bash
+set -euo pipefail
+
+venv/bin/python -c "import requests; requests.get('{wheel_url}').raise_for_status()"
+"""
 
     env = app_service.create_session(lxd_instance)
 
@@ -272,7 +175,7 @@ def test_build_instance_integration(
         # Download the craft-application wheel.
         lxd_instance.push_file_io(
             destination=pathlib.Path("/root/check-requests.sh"),
-            content=io.BytesIO(check_requests),
+            content=io.BytesIO(check_requests.encode("ascii")),
             file_mode="0644",
         )
         lxd_instance.execute_run(
@@ -0,0 +1,128 @@
+#  This file is part of craft-application.
+#
+#  Copyright 2024 Canonical Ltd.
+#
+#  This program is free software: you can redistribute it and/or modify it
+#  under the terms of the GNU Lesser General Public License version 3, as
+#  published by the Free Software Foundation.
+#
+#  This program is distributed in the hope that it will be useful, but WITHOUT
+#  ANY WARRANTY; without even the implied warranties of MERCHANTABILITY,
+#  SATISFACTORY QUALITY, or FITNESS FOR A PARTICULAR PURPOSE.
+#  See the GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""Tests for starting and stopping the fetch-service through FetchService.
+
+Each test here owns the lifecycle of the fetch-service process.
+"""
+import socket
+
+import pytest
+from craft_application import errors, fetch, services
+
+pytestmark = [pytest.mark.usefixtures("_set_test_base_dirs"), pytest.mark.serial]
+
+CONTROL = fetch._DEFAULT_CONFIG.control
+PROXY = fetch._DEFAULT_CONFIG.proxy
+
+
+@pytest.fixture
+def app_service(app_metadata, fake_services, fake_project, fake_build_plan):
+    fetch_service = services.FetchService(
+        app_metadata, fake_services, project=fake_project, build_plan=fake_build_plan
+    )
+    yield fetch_service
+    fetch_service.shutdown(force=True)
+
+
+def test_start_service(app_service):
+    assert not fetch.is_service_online()
+    app_service.setup()
+    assert fetch.is_service_online()
+
+
+def test_start_service_already_up(app_service, request):
+    # Create a fetch-service "manually"
+    fetch_process = fetch.start_service()
+    assert fetch.is_service_online()
+    # Ensure its cleaned up when the test is done
+    if fetch_process is not None:
+        request.addfinalizer(lambda: fetch.stop_service(fetch_process))
+
+    app_service.setup()
+    assert fetch.is_service_online()
+
+
+@pytest.mark.parametrize(
+    "port",
+    [
+        pytest.param(
+            CONTROL,
+            marks=pytest.mark.xfail(
+                reason="Needs https://github.com/canonical/fetch-service/issues/208 fixed",
+                strict=True,
+            ),
+        ),
+        PROXY,
+    ],
+)
+def test_start_service_port_taken(app_service, request, port):
+    # "Occupy" one of the necessary ports manually.
+    try:
+        soc = socket.create_server(("localhost", port), reuse_port=True)
+    except OSError as exc:
+        pytest.skip(f"Port {port} is not available: {exc}")
+    request.addfinalizer(soc.close)
+
+    assert not fetch.is_service_online()
+
+    expected = f"fetch-service ports {PROXY} and {CONTROL} are already in use."
+    with pytest.raises(errors.FetchServiceError, match=expected):
+        app_service.setup()
+
+
+def test_shutdown_service(app_service):
+    assert not fetch.is_service_online()
+
+    app_service.setup()
+    assert fetch.is_service_online()
+
+    # By default, shutdown() without parameters doesn't actually stop the
+    # fetch-service.
+    app_service.shutdown()
+    assert fetch.is_service_online()
+
+    # shutdown(force=True) must stop the fetch-service.
+    app_service.shutdown(force=True)
+    assert not fetch.is_service_online()
+
+
+def test_service_logging(app_service, mocker, tmp_path, monkeypatch, mock_instance):
+    monkeypatch.chdir(tmp_path)
+    mocker.patch.object(fetch, "_get_gateway", return_value="127.0.0.1")
+
+    # The base dir is shared by the whole session, so discard any previous log.
+    logfile = fetch._get_log_filepath()
+    logfile.unlink(missing_ok=True)
+
+    app_service.setup()
+
+    # Create and teardown two sessions
+    app_service.create_session(mock_instance)
+    app_service.teardown_session()
+    app_service.create_session(mock_instance)
+    app_service.teardown_session()
+
+    # Check the logfile for the creation/deletion of the two sessions
+    expected = 2
+    assert logfile.is_file()
+    lines = logfile.read_text().splitlines()
+    create = discard = 0
+    for line in lines:
+        if "creating session" in line:
+            create += 1
+        if "discarding session" in line:
+            discard += 1
+    assert create == discard == expected